@@ -1,13 +1,21 @@
-import requests
-from bs4 import BeautifulSoup, Tag
+import asyncio
+import codecs
+import hashlib
+import io
+import aiohttp
+from lxml import etree
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 import logging
-import time
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-import random
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set, Tuple, Union
 import redis
 from datetime import timedelta
+from models import Base, ScrapedProduct
 from storage import StorageStrategy, JsonFileStorage,DatabaseStorage
 
 # Configure logging
@@ -20,6 +28,260 @@ logging.basicConfig(
     ]
 )
 
+# Returned by WebScraper.get when the server answers a conditional request with 304
+NOT_MODIFIED = b''
+
+# Response validators cached per page, mapped to the request header that sends them back
+VALIDATOR_HEADERS = {'ETag': 'If-None-Match', 'Last-Modified': 'If-Modified-Since'}
+
+# CSS selectors used by extract_products, tried in order for product listings
+PRODUCT_SELECTORS = ('li.type-product', 'li.product', 'li')
+TITLE_SELECTOR = 'h2.woo-loop-product__title a'
+PRICE_SELECTOR = 'span.price bdi'
+IMAGE_SELECTOR = 'img'
+
+# Pages larger than this many bytes are streamed with lxml instead of parsed into a full DOM
+STREAMING_THRESHOLD = 1024 * 1024
+
+# XPath equivalents of the selectors above, compiled once for the streaming parser
+_LXML_TITLE_LINK = etree.XPath(".//h2[contains(concat(' ', normalize-space(@class), ' '), ' woo-loop-product__title ')]//a")
+_LXML_PRICE = etree.XPath(".//span[contains(concat(' ', normalize-space(@class), ' '), ' price ')]//bdi")
+_LXML_IMAGE = etree.XPath(".//img")
+
+# Charset declared by a <meta> tag, searched for near the start of the page
+_META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+# Currency symbols and whitespace removed from scraped prices in one pass
+_PRICE_STRIP = re.compile(r'[\s\u20b9]')
+
+def _clean_price(price_str: Optional[str]) -> Optional[str]:
+    """Clean price strings by removing currency symbols and whitespace."""
+    if not price_str:
+        return None
+    return _PRICE_STRIP.sub('', price_str)
+
+@lru_cache(maxsize=4096)
+def _slug_to_title(product_url: str) -> str:
+    """Build a product title from the last path segment of its URL."""
+    return product_url.rsplit('product/', 1)[-1].rstrip('/').rsplit('/', 1)[-1].replace('-', ' ').title()
+
+def _price_wrapper(node: LexborNode) -> Optional[str]:
+    """Return 'ins' or 'del' when a price node sits inside a sale or struck-out price."""
+    node = node.parent
+    while node is not None and node.tag != 'li':
+        if node.tag in ('ins', 'del'):
+            return node.tag
+        node = node.parent
+    return None
+
+def _fingerprint(product: ScrapedProduct) -> str:
+    """Short digest of the fields that decide whether a cached product changed."""
+    key = f'{product.price}|{product.regular_price}|{product.image_url}|{int(product.on_sale)}'
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+def _decode_page(body: bytes, charset: Optional[str]) -> Union[bytes, str]:
+    """Return UTF-8 pages as bytes and decode any other encoding to str.
+
+    lexbor reads bytes as UTF-8 regardless of the page's declared charset, so
+    other encodings must be decoded before parsing. `charset` comes from the
+    Content-Type header; without one the page's <meta> charset is used.
+    """
+    if not charset:
+        match = _META_CHARSET.search(body, 0, 2048)
+        charset = match.group(1).decode('ascii') if match else None
+    if not charset:
+        return body
+    
+    try:
+        encoding = codecs.lookup(charset).name
+    except LookupError:
+        logging.warning(f"Unknown page charset {charset!r}, parsing as UTF-8")
+        return body
+    
+    if encoding == 'utf-8':
+        return body
+    if encoding == 'iso8859-1':
+        # Browsers treat ISO-8859-1 labels as windows-1252
+        encoding = 'cp1252'
+    return body.decode(encoding, errors='replace')
+
+def _lxml_price_wrapper(node: etree._Element) -> Optional[str]:
+    """Return 'ins' or 'del' when an lxml price node sits inside a sale or struck-out price."""
+    for ancestor in node.iterancestors():
+        if ancestor.tag in ('ins', 'del'):
+            return ancestor.tag
+        if ancestor.tag == 'li':
+            break
+    return None
+
+def _is_product_item(elem: etree._Element) -> bool:
+    classes = (elem.get('class') or '').split()
+    return 'type-product' in classes or 'product' in classes
+
+def _build_product(
+    product_url: str,
+    price_amounts: List[Tuple[str, Optional[str]]],
+    image_attrs: Optional[Dict[str, Optional[str]]]
+) -> Optional[ScrapedProduct]:
+    """Build a product from the fields either parser located, or None if it is incomplete.
+
+    `price_amounts` holds the text of each price amount and its 'ins'/'del'
+    wrapper, in document order.
+    """
+    # Extract title and URL with better error handling
+    product_url = product_url.strip()
+    name = _slug_to_title(product_url) if product_url else None
+
+    if not name or not product_url:
+        logging.warning("Skipping product with missing name or URL")
+        return None
+
+    # Extract price with better error handling
+    price = None
+    regular = None
+    sale_price = False
+
+    sale_text = None
+    regular_text = None
+    for text, wrapper in price_amounts:
+        if wrapper == 'ins' and sale_text is None:
+            sale_text = text
+        elif wrapper == 'del' and regular_text is None:
+            regular_text = text
+
+    if sale_text is not None:
+        price = _clean_price(sale_text)
+        regular = _clean_price(regular_text)
+        sale_price = True
+    elif price_amounts:
+        price = _clean_price(price_amounts[0][0])
+        regular = price
+
+    if not price:
+        logging.warning(f"No price found for product: {name}")
+        return None
+
+    # Extract image with better error handling
+    image_url = None
+    if image_attrs is not None:
+        # Try multiple image sources
+        image_url = (
+            image_attrs.get('data-src') or 
+            image_attrs.get('data-lazy-src') or 
+            image_attrs.get('src')
+        )
+
+        if image_url and image_url.startswith('data:image/svg'):
+            srcset = (image_attrs.get('srcset') or '').strip()
+            if srcset:
+                first_candidate = srcset.partition(',')[0]
+                image_url = first_candidate.strip().partition(' ')[0]
+
+    return ScrapedProduct(
+        title=name,
+        url=product_url,
+        price=price,
+        regular_price=regular or price,
+        image_url=image_url,
+        on_sale=sale_price
+    )
+
+def _parse_products(html_content: Union[bytes, str]) -> Tuple[int, List[ScrapedProduct]]:
+    """Extract products from a full lexbor DOM of the page."""
+    tree = LexborHTMLParser(html_content)
+    products: List[LexborNode] = []
+    for selector in PRODUCT_SELECTORS:
+        products = tree.css(selector)
+        if products:
+            break
+
+    logging.info(f"Found {len(products)} products")
+
+    page_products: List[ScrapedProduct] = []
+    for product in products:
+        try:
+            title_link = product.css_first(TITLE_SELECTOR)
+            product_url = (title_link.attributes.get('href') or '') if title_link else ''
+
+            # Select all price amounts once and classify them by their ins/del wrapper
+            price_amounts = [(bdi.text(), _price_wrapper(bdi)) for bdi in product.css(PRICE_SELECTOR)]
+
+            image = product.css_first(IMAGE_SELECTOR)
+            product_data = _build_product(product_url, price_amounts, image.attributes if image else None)
+            if product_data:
+                page_products.append(product_data)
+
+        except Exception as e:
+            logging.error(f"Error parsing product: {e}")
+            continue
+
+    return len(products), page_products
+
+def _stream_products(html_content: Union[bytes, str]) -> Optional[Tuple[int, List[ScrapedProduct]]]:
+    """Extract products with lxml iterparse, discarding each <li> as soon as it has been read.
+
+    Only the product currently being read is held as a tree, so peak memory
+    stays around one product instead of the whole page DOM. Returns None when
+    no product items are found, so the caller can fall back to the full parse.
+    """
+    # Bytes reaching the parser are UTF-8 (see _decode_page); decoded pages are re-encoded
+    if isinstance(html_content, str):
+        html_content = html_content.encode('utf-8')
+
+    products_found = 0
+    open_products = 0
+    page_products: List[ScrapedProduct] = []
+    context = etree.iterparse(
+        io.BytesIO(html_content), events=('start', 'end'), tag='li', html=True, encoding='utf-8'
+    )
+    for event, elem in context:
+        is_product = _is_product_item(elem)
+        if event == 'start':
+            open_products += is_product
+            continue
+
+        if is_product:
+            open_products -= 1
+            products_found += 1
+            try:
+                title_links = _LXML_TITLE_LINK(elem)
+                product_url = (title_links[0].get('href') or '') if title_links else ''
+                price_amounts = [
+                    (''.join(bdi.itertext()), _lxml_price_wrapper(bdi)) for bdi in _LXML_PRICE(elem)
+                ]
+                images = _LXML_IMAGE(elem)
+                product_data = _build_product(product_url, price_amounts, dict(images[0].attrib) if images else None)
+                if product_data:
+                    page_products.append(product_data)
+            except Exception as e:
+                logging.error(f"Error parsing product: {e}")
+
+        # Free finished items and their earlier siblings, unless a product is still open around them
+        if open_products == 0:
+            elem.clear()
+            parent = elem.getparent()
+            while elem.getprevious() is not None:
+                del parent[0]
+
+    if not products_found:
+        return None
+
+    logging.info(f"Found {products_found} products")
+    return products_found, page_products
+
+def extract_products(html_content: Union[bytes, str]) -> Tuple[int, List[ScrapedProduct]]:
+    """Parse a listing page and return the number of product nodes found and the valid products.
+
+    Pages above STREAMING_THRESHOLD are streamed with lxml to bound memory;
+    smaller pages, or large pages without product items, use the lexbor DOM.
+    Kept at module level so it can run in a worker process.
+    """
+    if len(html_content) > STREAMING_THRESHOLD:
+        streamed = _stream_products(html_content)
+        if streamed is not None:
+            return streamed
+    return _parse_products(html_content)
+
 class WebScraper:
     def __init__(
         self, 
@@ -29,26 +291,43 @@ class WebScraper:
         user_agent: str = 'MyScraperBot/1.0',
         auth_token: Optional[str] = None,
         redis_url: str = 'redis://localhost:6379/0',
-        proxy: Optional[Dict[str, str]] = None
+        proxy: Optional[Dict[str, str]] = None,
+        concurrency: int = 5,
+        rate_limit: float = 5.0
     ):
         self.base_url = base_url.rstrip('/')  # Ensure no trailing slash
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': user_agent,
-            'Authorization': f'Bearer {auth_token}' if auth_token else ''
-        })
+            'Authorization': f'Bearer {auth_token}' if auth_token else '',
+            'Accept-Encoding': 'gzip, deflate'
+        }
         
         # Add proxy configuration if provided
+        self.proxies: Dict[str, str] = {}
         if proxy:
-            self.session.proxies.update(proxy)
+            self.proxies.update(proxy)
             logging.info(f"Using proxy: {proxy}")
         
-        self.delay = 1  # Default delay
-        logging.info(f"Using default delay of {self.delay} seconds")
+        # Minimum gap between request starts, shared by all concurrent fetches
+        if rate_limit <= 0:
+            raise ValueError(f"rate_limit must be positive, got {rate_limit}")
+        self.delay = 1 / rate_limit
+        self._next_request_at = 0.0
+        logging.info(f"Limiting requests to {rate_limit} per second")
+        
+        # Maximum number of pages fetched at the same time
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self.concurrency = concurrency
+        logging.info(f"Fetching up to {self.concurrency} pages concurrently")
+        
+        # Worker processes for parsing fetched pages
+        self._pool = ProcessPoolExecutor(max_workers=os.cpu_count())
     
         # Initialize the database with better error handling
         try:
             self.engine = create_engine(db_url)
+            Base.metadata.create_all(self.engine)
             self.Session = sessionmaker(bind=self.engine)
             self.db_session = self.Session()
             logging.info(f"Database initialized at {db_url}")
@@ -58,7 +337,8 @@ class WebScraper:
         
         # Initialize storage strategy
         self.storage_strategy = storage_strategy or JsonFileStorage()
-        self.products: List[Dict[str, Any]] = []
+        self.products: List[ScrapedProduct] = []
+        self._seen_urls: Set[str] = set()
         
         # Initialize Redis with better error handling
         try:
@@ -69,177 +349,278 @@ class WebScraper:
             logging.error(f"Failed to connect to Redis: {e}")
             self.redis_client = None
     
-    def clean_price(self, price_str: Optional[str]) -> Optional[str]:
-        """Clean price strings by removing currency symbols and whitespace."""
-        if not price_str:
-            return None
-        return price_str.strip().replace('₹', '').replace('\u20b9', '').strip()
-
-    def get(self, url: str, params: Optional[Dict[str, Any]] = None, max_retries: int = 3, retry_delay: int = 5) -> Optional[str]:
+    async def get(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        max_retries: int = 3,
+        retry_delay: int = 5
+    ) -> Optional[Tuple[Union[bytes, str], Dict[str, str]]]:
+        """Fetch a page, returning its body and ETag/Last-Modified validators, or None on failure."""
+        proxy = self.proxies.get(url.split('://', 1)[0])
+        timeout = aiohttp.ClientTimeout(total=10)
         for attempt in range(max_retries):
             try:
                 # Check if Authorization header is present
-                if not self.session.headers.get('Authorization'):
+                if not self.headers.get('Authorization'):
                     logging.warning("No authentication token provided")
                 
-                # Try with SSL verification first
+                # Try with SSL verification first, waiting on the shared rate limiter before every request
                 try:
-                    response = self.session.get(url, params=params, timeout=10)
-                except requests.exceptions.SSLError:
+                    await self._throttle()
+                    async with session.get(url, params=params, headers=headers, proxy=proxy, timeout=timeout) as response:
+                        response.raise_for_status()
+                        page = await self._read_body(url, response)
+                except aiohttp.ClientSSLError:
                     logging.warning("SSL verification failed, retrying without verification")
-                    response = self.session.get(url, params=params, timeout=10, verify=False)
+                    await self._throttle()
+                    async with session.get(url, params=params, headers=headers, proxy=proxy, timeout=timeout, ssl=False) as response:
+                        response.raise_for_status()
+                        page = await self._read_body(url, response)
                 
+                logging.info(f"Successfully fetched: {url}")
+                return page
+            except aiohttp.ClientResponseError as e:
                 # Handle authentication errors
-                if response.status_code == 401:
+                if e.status == 401:
                     logging.error("Authentication failed: Invalid or missing token")
                     return None
-                
-                response.raise_for_status()
-                logging.info(f"Successfully fetched: {url}")
-                time.sleep(self.delay + random.uniform(0, 1))
-                return response.text
-            except requests.exceptions.RequestException as e:
-                if attempt < max_retries - 1:
-                    logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for {url}: {e}. Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                else:
-                    logging.error(f"All {max_retries} attempts failed for {url}: {e}")
+                error = e
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = e
+            
+            if attempt < max_retries - 1:
+                logging.warning(f"Attempt {attempt + 1}/{max_retries} failed for {url}: {error}. Retrying in {retry_delay} seconds...")
+                await asyncio.sleep(retry_delay)
+            else:
+                logging.error(f"All {max_retries} attempts failed for {url}: {error}")
         return None
     
-    def parse(self, html_content: str) -> BeautifulSoup:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        products: List[Tag] = soup.find_all('li', class_='type-product')
-        if not products:
-            products = soup.find_all('li', class_='product')
-        if not products:
-            products = soup.find_all('li')
+    def _load_conditional_headers(self, urls: List[str]) -> Dict[str, Dict[str, str]]:
+        """Build If-None-Match/If-Modified-Since headers per URL from validators cached in Redis.
+
+        All pages are looked up with a single MGET before fetching starts, so
+        no Redis round-trip happens while requests are in flight.
+        """
+        if not self.redis_client or not urls:
+            return {}
         
-        self.products_found_in_page = len(products)
-        logging.info(f"Found {self.products_found_in_page} products")
+        keys = [f'{header.lower()}:{url}' for url in urls for header in VALIDATOR_HEADERS]
+        try:
+            cached_values = iter(self.redis_client.mget(keys))
+        except redis.RedisError as e:
+            logging.error(f"Redis error while reading cached validators: {e}")
+            return {}
         
-        for product in products:
-            try:
-                # Extract title and URL with better error handling
-                title_element = product.find('h2', class_='woo-loop-product__title')
-                name = None
-                product_url = None
-                
-                if title_element and title_element.a:
-                    name = title_element.a.get_text(strip=True)
-                    product_url = title_element.a.get('href', '').strip()
-                    if product_url:
-                        url_name = product_url.split('product/')[-1].rstrip('/')
-                        url_name = url_name.split('/')[-1]
-                        name = ' '.join(url_name.split('-')).title()
-                
-                if not name or not product_url:
-                    logging.warning("Skipping product with missing name or URL")
-                    continue
-                
-                # Extract price with better error handling
-                price = None
-                regular = None
-                sale_price = False
-                
-                price_element = product.find('span', class_='price')
-                if price_element:
-                    sale_elem = price_element.find('ins')
-                    regular_elem = price_element.find('del')
-                    
-                    if sale_elem and sale_elem.find('bdi'):
-                        price = self.clean_price(sale_elem.find('bdi').get_text())
-                        regular = self.clean_price(regular_elem.find('bdi').get_text()) if regular_elem else None
-                        sale_price = True
-                    elif price_element.find('bdi'):
-                        price = self.clean_price(price_element.find('bdi').get_text())
-                        regular = price
-                
-                if not price:
-                    logging.warning(f"No price found for product: {name}")
-                    continue
-                
-                # Extract image with better error handling
-                image_url = None
-                image = product.find('img')
-                if image:
-                    # Try multiple image sources
-                    image_url = (
-                        image.get('data-src') or 
-                        image.get('data-lazy-src') or 
-                        image.get('src')
-                    )
-                    
-                    if image_url and image_url.startswith('data:image/svg'):
-                        srcset = image.get('srcset', '').strip()
-                        if srcset:
-                            image_url = srcset.split(',')[0].split(' ')[0]
-                
-                # Create product dictionary
-                product_data = {
-                    "product_title": name,
-                    "product_url": product_url,
-                    "product_price": price,
-                    "regular_price": regular or price,
-                    "path_to_image": image_url,
-                    "on_sale": sale_price
-                }
-                
-                # Check cache if Redis is available
-                if self.redis_client and product_url:
-                    try:
-                        cached_price = self.redis_client.get(product_url)
-                        if cached_price:
-                            cached_price = cached_price.decode('utf-8')
-                            if cached_price == price:
-                                logging.info(f"Product price unchanged, skipping update: {name}")
-                                continue
-                        
-                        # Store new price in cache
-                        self.redis_client.setex(
-                            product_url,
-                            timedelta(hours=24),
-                            price
-                        )
-                    except redis.RedisError as e:
-                        logging.error(f"Redis error for product {name}: {e}")
-                
-                self.products.append(product_data)
-                
-            except Exception as e:
-                logging.error(f"Error parsing product: {e}")
+        conditional_headers = {}
+        for url in urls:
+            headers = {}
+            for request_header in VALIDATOR_HEADERS.values():
+                value = next(cached_values)
+                if value:
+                    headers[request_header] = value.decode('utf-8')
+            conditional_headers[url] = headers
+        return conditional_headers
+    
+    def _store_validators(self, validators: Dict[str, Dict[str, str]]) -> None:
+        """Cache page validators in Redis with one pipelined batch of SETEX calls."""
+        if not self.redis_client or not validators:
+            return
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for url, page_validators in validators.items():
+                for header, value in page_validators.items():
+                    pipe.setex(f'{header.lower()}:{url}', timedelta(hours=24), value)
+            pipe.execute()
+        except redis.RedisError as e:
+            logging.error(f"Redis error while caching validators: {e}")
+    
+    async def _read_body(self, url: str, response: aiohttp.ClientResponse) -> Tuple[Union[bytes, str], Dict[str, str]]:
+        """Read a page body, decoded if it is not UTF-8, along with the validators for the next conditional request."""
+        if response.status == 304:
+            logging.info(f"Page not modified since last scrape: {url}")
+            return NOT_MODIFIED, {}
+        
+        body = await response.read()
+        validators = {
+            header: response.headers[header]
+            for header in VALIDATOR_HEADERS
+            if response.headers.get(header)
+        }
+        charset = response.get_encoding() if response.charset else None
+        return _decode_page(body, charset), validators
+    
+    async def _throttle(self) -> None:
+        """Wait for the next request slot so request starts stay `delay` seconds apart."""
+        now = asyncio.get_running_loop().time()
+        start_at = max(now, self._next_request_at)
+        self._next_request_at = start_at + self.delay
+        await asyncio.sleep(start_at - now)
+    
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[Union[bytes, str], Dict[str, str]]]:
+        """Fetch a page; get() applies the rate limit to every request it makes."""
+        return await self.get(session, url, headers=headers)
+    
+    def drop_seen(self, products: List[ScrapedProduct]) -> List[ScrapedProduct]:
+        """Drop products whose URL was already seen earlier in the current scrape."""
+        unseen_products = []
+        for product_data in products:
+            if product_data.url in self._seen_urls:
                 continue
+            self._seen_urls.add(product_data.url)
+            unseen_products.append(product_data)
+        return unseen_products
+    
+    def filter_cached(self, products: List[ScrapedProduct]) -> List[ScrapedProduct]:
+        """Drop products that are unchanged since they were cached in Redis.
+
+        Products are compared by a fingerprint of their price, regular price,
+        image and sale flag, looked up with one MGET per page instead of a
+        round-trip per product.
+        """
+        if not self.redis_client or not products:
+            return products
+        
+        try:
+            fingerprints = [_fingerprint(p) for p in products]
+            cached_fingerprints = self.redis_client.mget([p.url for p in products])
+            
+            changed_products = []
+            for product_data, fingerprint, cached in zip(products, fingerprints, cached_fingerprints):
+                if cached and cached.decode('utf-8') == fingerprint:
+                    logging.info(f"Product unchanged, skipping update: {product_data.title}")
+                    continue
+                changed_products.append(product_data)
+            products = changed_products
+        except redis.RedisError as e:
+            logging.error(f"Redis error while checking cached products: {e}")
         
-        return soup
+        return products
     
-    def scrape(self, max_page: int = 1) -> None:
+    def _cache_fingerprints(self, products: List[ScrapedProduct]) -> None:
+        """Cache product fingerprints in Redis with one pipelined batch of SETEX calls."""
+        if not self.redis_client or not products:
+            return
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for product_data in products:
+                pipe.setex(product_data.url, timedelta(hours=24), _fingerprint(product_data))
+            pipe.execute()
+        except redis.RedisError as e:
+            logging.error(f"Redis error while caching products: {e}")
+    
+    async def _scrape_page(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> Optional[Tuple[int, List[ScrapedProduct], Dict[str, str], bool]]:
+        """Fetch a page and parse it in a worker process as soon as it arrives.
+
+        The concurrency slot is held until parsing finishes, so at most
+        `concurrency` raw page bodies are in memory at any time; large pages
+        are streamed rather than built into a full DOM (see extract_products).
+        Returns the product count, the products, the page's validators and
+        whether the page changed since the last scrape, or None if the page
+        could not be retrieved.
+        """
+        async with self._semaphore:
+            page = await self._fetch(session, url, headers)
+            if page is None:
+                return None
+            page_content, validators = page
+            if page_content == NOT_MODIFIED:
+                # Unchanged since the last scrape, so every product on it is already cached
+                return 0, [], {}, False
+            
+            # Parsing is CPU-bound, so it runs in the worker process pool
+            loop = asyncio.get_running_loop()
+            products_found_in_page, page_products = await loop.run_in_executor(
+                self._pool, extract_products, page_content
+            )
+        return products_found_in_page, page_products, validators, True
+    
+    async def scrape(self, max_page: int = 1) -> None:
         self.products = []  # Reset products list
+        self._seen_urls.clear()
         total_products_found = 0
         total_products_cached = 0
+        total_duplicates = 0
+        pages_not_modified = 0
         saved_products = 0
         
-        for page_num in range(1, max_page + 1):
-            # Construct page URL
-            page_url = f"{self.base_url}/page/{page_num}/" if page_num > 1 else f"{self.base_url}/"
-            logging.info(f"Scraping page {page_num}: {page_url}")
+        # Construct page URLs up front so they can be fetched concurrently
+        page_urls = [
+            f"{self.base_url}/page/{page_num}/" if page_num > 1 else f"{self.base_url}/"
+            for page_num in range(1, max_page + 1)
+        ]
+        logging.info(f"Scraping {len(page_urls)} pages from {self.base_url}")
+        
+        conditional_headers = self._load_conditional_headers(page_urls)
+        
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._next_request_at = 0.0
+        # Keep one warm connection per concurrent fetch and reuse it across pages
+        connector = aiohttp.TCPConnector(
+            limit=50,
+            limit_per_host=self.concurrency,
+            keepalive_timeout=85,
+            ttl_dns_cache=300
+        )
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            parsed_pages = await asyncio.gather(
+                *[self._scrape_page(session, page_url, conditional_headers.get(page_url)) for page_url in page_urls],
+                return_exceptions=True
+            )
+        
+        # Merge pages in order, up to the first one that could not be retrieved
+        page_validators: Dict[str, Dict[str, str]] = {}
+        for page_num, (page_url, parsed_page) in enumerate(zip(page_urls, parsed_pages), start=1):
+            if isinstance(parsed_page, BaseException):
+                logging.error(f"Error scraping page {page_num}: {parsed_page}")
+                parsed_page = None
             
-            page_content = self.get(page_url)
-            if page_content:
-                products_before = len(self.products)
-                self.parse(page_content)
-                products_found_this_page = len(self.products) - products_before
-                total_products_found += self.products_found_in_page
-                total_products_cached += (self.products_found_in_page - products_found_this_page)
-            else:
+            if parsed_page is None:
                 logging.error(f"Failed to retrieve page {page_num}.")
                 break
+            
+            products_found_in_page, page_products, validators, modified = parsed_page
+            if not modified:
+                pages_not_modified += 1
+                continue
+            if validators:
+                page_validators[page_url] = validators
+            # Drop repeats in memory before the Redis check, counting them separately
+            unseen_products = self.drop_seen(page_products)
+            duplicates_in_page = len(page_products) - len(unseen_products)
+            page_products = self.filter_cached(unseen_products)
+            self.products.extend(page_products)
+            total_products_found += products_found_in_page
+            total_duplicates += duplicates_in_page
+            total_products_cached += (products_found_in_page - duplicates_in_page - len(page_products))
         
         # Save products with better error handling
+        save_succeeded = False
         if not self.products:
-            logging.warning("No products to save")
+            if pages_not_modified:
+                logging.info(f"No products to save; {pages_not_modified} pages were not modified since the last scrape")
+            else:
+                logging.warning("No products to save")
             saved_products = 0
+            save_succeeded = True
         else:
             try:
                 result = self.storage_strategy.save_products(self.products)
+                save_succeeded = result is None or bool(result)
                 if isinstance(result, bool):
                     saved_products = len(self.products) if result else 0
                 elif isinstance(result, int):
@@ -258,20 +639,45 @@ class WebScraper:
                         logging.error(f"Error updating products: {update_error}")
                         saved_products = 0
         
+        # Only cache fingerprints and validators once the products are stored,
+        # otherwise the next run would skip products that were never saved
+        if save_succeeded:
+            self._cache_fingerprints(self.products)
+            self._store_validators(page_validators)
+        
         # Print summary
         print("\n=== Scraping Session Summary ===")
+        print(f"Pages not modified: {pages_not_modified}")
         print(f"Total products found: {total_products_found}")
         print(f"Products skipped (cached): {total_products_cached}")
+        print(f"Products skipped (duplicate): {total_duplicates}")
         print(f"Products successfully saved: {saved_products}")
         print("===============================\n")
 
-    def __del__(self):
-        """Cleanup method to close database session."""
+    def close(self) -> None:
+        """Release the database session, engine pool, parser workers and Redis connection."""
         try:
             if hasattr(self, 'db_session'):
                 self.db_session.close()
+            if hasattr(self, 'engine'):
+                self.engine.dispose()
         except Exception as e:
             logging.error(f"Error closing database session: {e}")
+        
+        if hasattr(self, '_pool'):
+            self._pool.shutdown()
+        
+        try:
+            if getattr(self, 'redis_client', None):
+                self.redis_client.close()
+        except redis.RedisError as e:
+            logging.error(f"Error closing Redis connection: {e}")
+    
+    def __enter__(self) -> 'WebScraper':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 if __name__ == "__main__":
     BASE_URL = "https://dentalstall.com/shop"
@@ -284,22 +690,19 @@ if __name__ == "__main__":
     }
     
     try:
-        scraper = WebScraper(
+        with WebScraper(
             BASE_URL, 
             storage_strategy=None,
             auth_token=AUTH_TOKEN, 
             redis_url=REDIS_URL,
             proxy=PROXY
-        )
-        
-        scraper.storage_strategy = DatabaseStorage(scraper.db_session)    
-        scraper.scrape(MAX_PAGE)
-    except requests.exceptions.ProxyError as e:
-        logging.error(f"Proxy connection failed: {e}. Falling back to direct connection.")
-        scraper.session.proxies.clear()
-        scraper.scrape(MAX_PAGE)
+        ) as scraper:
+            scraper.storage_strategy = DatabaseStorage(scraper.db_session)    
+            try:
+                asyncio.run(scraper.scrape(MAX_PAGE))
+            except aiohttp.ClientProxyConnectionError as e:
+                logging.error(f"Proxy connection failed: {e}. Falling back to direct connection.")
+                scraper.proxies.clear()
+                asyncio.run(scraper.scrape(MAX_PAGE))
     except Exception as e:
         logging.error(f"Scraping failed: {e}")
-    finally:
-        if 'scraper' in locals():
-            del scraper  # Ensure cleanup
\ No newline at end of file
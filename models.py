@@ -1,6 +1,6 @@
-from typing import Optional
+from typing import NamedTuple, Optional
 from sqlalchemy.orm import DeclarativeBase, mapped_column, Mapped
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Boolean, String, Text
 
 class Base(DeclarativeBase):
     pass
@@ -9,9 +9,18 @@ class Product(Base):
     __tablename__ = 'products'
     
     id: Mapped[int] = mapped_column(primary_key=True)
-    title: Mapped[str] = mapped_column(String(255), nullable=False)
+    title: Mapped[str] = mapped_column(String(500), nullable=False)
     url: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
     price: Mapped[Optional[str]] = mapped_column(String(50))
     regular_price: Mapped[Optional[str]] = mapped_column(String(50))
     image_url: Mapped[Optional[str]] = mapped_column(Text)
-    on_sale: Mapped[bool] = mapped_column(Integer)
\ No newline at end of file
+    on_sale: Mapped[bool] = mapped_column(Boolean, default=False)
+
+class ScrapedProduct(NamedTuple):
+    """A product scraped from a listing page, in products table column order."""
+    title: str
+    url: str
+    price: str
+    regular_price: str
+    image_url: Optional[str]
+    on_sale: bool
\ No newline at end of file
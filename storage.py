@@ -2,70 +2,64 @@ from abc import ABC, abstractmethod
 from typing import List, Dict, Any
 import os
 import json
+import sqlite3
 import logging
-from sqlalchemy import Column, Integer, String, Boolean, Table, MetaData
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import SQLAlchemyError
-import logging
-from typing import List, Dict, Any
+from models import Product, ScrapedProduct
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
 
 class StorageStrategy(ABC):
     @abstractmethod
-    def save_products(self, products: List[Dict[str, Any]]) -> None:
+    def save_products(self, products: List[ScrapedProduct]) -> None:
         pass
 
 class JsonFileStorage(StorageStrategy):
+    # Output keys, in ScrapedProduct field order
+    JSON_KEYS = ('product_title', 'product_url', 'product_price', 'regular_price', 'path_to_image', 'on_sale')
+
     def __init__(self, file_path: str = 'products.json'):
         self.file_path = file_path
 
-    def save_products(self, products: List[Dict[str, Any]]) -> None:
+    def save_products(self, products: List[ScrapedProduct]) -> None:
         # Ensure directory exists
         os.makedirs(os.path.dirname(self.file_path) if os.path.dirname(self.file_path) else '.', exist_ok=True)
         
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(products, f, indent=2)
+        products = [dict(zip(self.JSON_KEYS, product)) for product in products]
+        if orjson is not None:
+            with open(self.file_path, 'wb') as f:
+                f.write(orjson.dumps(products, option=orjson.OPT_INDENT_2))
+        else:
+            with open(self.file_path, 'w', encoding='utf-8') as f:
+                json.dump(products, f, indent=2, ensure_ascii=False)
         logging.info(f"Products saved to {self.file_path}")
 
 class DatabaseStorage(StorageStrategy):
+    # Columns refreshed from the scraped data when a product URL already exists
+    UPSERT_COLUMNS = ('title', 'price', 'regular_price', 'image_url', 'on_sale')
+
     def __init__(self, session):
         self.session = session
-        self.setup_database()
+        # Schema is defined once in models.Product and created by WebScraper
+        self.products_table = Product.__table__
 
-    def setup_database(self) -> None:
-        """Initialize the database schema if it doesn't exist."""
-        metadata = MetaData()
-        
-        # Define the products table
-        self.products_table = Table(
-            'products', metadata,
-            Column('id', Integer, primary_key=True),
-            Column('title', String(500), nullable=False),
-            Column('url', String(500), unique=True, nullable=False),
-            Column('price', String(50)),
-            Column('regular_price', String(50)),
-            Column('image_url', String(500)),
-            Column('on_sale', Boolean, default=False)
-        )
-
-        # Create the table if it doesn't exist
-        try:
-            metadata.create_all(self.session.get_bind())
-            logging.info("Database tables created successfully")
-        except SQLAlchemyError as e:
-            logging.error(f"Error creating database tables: {e}")
-            raise
-
-    def clean_product_data(self, product: Dict[str, Any]) -> Dict[str, Any]:
+    def clean_product_data(self, product: ScrapedProduct) -> Dict[str, Any]:
         """Clean and validate product data before saving."""
         return {
-            'title': str(product.get('product_title', '')),
-            'url': str(product.get('product_url', '')),
-            'price': str(product.get('product_price', '0.00')),
-            'regular_price': str(product.get('regular_price', '0.00')),
-            'image_url': str(product.get('path_to_image', '')),
-            'on_sale': bool(product.get('on_sale', False))
+            'title': str(product.title or ''),
+            'url': str(product.url or ''),
+            'price': str(product.price or '0.00'),
+            'regular_price': str(product.regular_price or '0.00'),
+            'image_url': str(product.image_url or ''),
+            'on_sale': bool(product.on_sale)
         }
 
-    def save_products(self, products: List[Dict[str, Any]]) -> int:
+    def save_products(self, products: List[ScrapedProduct]) -> int:
         """
         Save products to database, handling both inserts and updates.
         Returns the number of successfully saved products.
@@ -74,59 +68,79 @@ class DatabaseStorage(StorageStrategy):
             logging.warning("No products to save")
             return 0
 
-        saved_count = 0
-        
+        # Clean and validate the product data, keeping the last row per URL
+        rows: Dict[str, Dict[str, Any]] = {}
         for product in products:
-            try:
-                # Clean and validate the product data
-                clean_data = self.clean_product_data(product)
-                
-                # Skip if required fields are missing
-                if not clean_data['url'] or not clean_data['title']:
-                    logging.warning(f"Skipping product with missing required fields: {clean_data}")
-                    continue
-
-                # Check if product exists
-                existing = self.session.execute(
-                    self.products_table.select().where(
-                        self.products_table.c.url == clean_data['url']
-                    )
-                ).first()
+            clean_data = self.clean_product_data(product)
+
+            # Skip if required fields are missing
+            if not clean_data['url'] or not clean_data['title']:
+                logging.warning(f"Skipping product with missing required fields: {clean_data}")
+                continue
+
+            rows[clean_data['url']] = clean_data
+
+        if not rows:
+            return 0
 
-                if existing:
-                    # Update existing product
-                    self.session.execute(
+        dialect = self.session.get_bind().dialect.name
+        if dialect == 'sqlite' and sqlite3.sqlite_version_info >= (3, 24, 0):
+            insert = sqlite_insert
+        elif dialect == 'postgresql':
+            insert = pg_insert
+        else:
+            return self._save_products_individually(list(rows.values()))
+
+        # Insert new products and update existing ones in a single statement
+        try:
+            stmt = insert(self.products_table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['url'],
+                set_={column: stmt.excluded[column] for column in self.UPSERT_COLUMNS}
+            )
+            with self.session.no_autoflush:
+                self.session.execute(stmt, list(rows.values()))
+            self.session.commit()
+            logging.info(f"Successfully saved {len(rows)} products")
+        except SQLAlchemyError as e:
+            logging.error(f"Error upserting products: {str(e)}")
+            self.session.rollback()
+            return 0
+
+        return len(rows)
+
+    def _save_products_individually(self, rows: List[Dict[str, Any]]) -> int:
+        """
+        Save cleaned product rows one at a time where ON CONFLICT is unavailable.
+        All rows are written in one transaction; any failure rolls back the whole batch.
+        Returns the number of successfully saved products.
+        """
+        try:
+            with self.session.no_autoflush:
+                for clean_data in rows:
+                    # Update existing product, using the rowcount as the existence check
+                    result = self.session.execute(
                         self.products_table.update()
                         .where(self.products_table.c.url == clean_data['url'])
                         .values(**clean_data)
                     )
-                else:
-                    # Insert new product
-                    self.session.execute(
-                        self.products_table.insert().values(**clean_data)
-                    )
-                
-                saved_count += 1
 
-            except SQLAlchemyError as e:
-                logging.error(f"Database error for product {clean_data.get('title')}: {str(e)}")
-                self.session.rollback()
-                continue
-            except Exception as e:
-                logging.error(f"Unexpected error processing product: {str(e)}")
-                continue
+                    if result.rowcount == 0:
+                        # Insert new product
+                        self.session.execute(
+                            self.products_table.insert().values(**clean_data)
+                        )
 
-        try:
             self.session.commit()
-            logging.info(f"Successfully saved {saved_count} products")
+            logging.info(f"Successfully saved {len(rows)} products")
         except SQLAlchemyError as e:
-            logging.error(f"Error committing changes to database: {str(e)}")
+            logging.error(f"Error saving products, rolling back batch: {str(e)}")
             self.session.rollback()
             return 0
 
-        return saved_count
+        return len(rows)
 
-    def update_existing_products(self, products: List[Dict[str, Any]]) -> int:
+    def update_existing_products(self, products: List[ScrapedProduct]) -> int:
         """
         Update only existing products in the database.
         Returns the number of successfully updated products.